@@ -20,14 +20,31 @@
 
 依赖（用于输入地点名自动查经度）：
     pip install geopy
+可选依赖（大批量坐标处理更快）：
+    pip install numpy
+    pip install numba   # 千万级经度批量分区
 """
 
 from __future__ import annotations
 
+import argparse
 import math
 import re
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+import sqlite3
+import sys
+import time
+from bisect import bisect_right
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, List, NamedTuple, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    from geopy.geocoders import Nominatim
 
 
 # ===== 可按需要调整的参数 =====
@@ -35,6 +52,27 @@ ZONE_WIDTH_DEG = 36.0
 # 用“廊坊经线”作为第9区的东边界（不含）。默认取 116.7°E
 LANGFANG_LON_EAST_BOUNDARY = 116.7
 
+# 地理编码本地缓存（sqlite）：同一地点名在有效期内不再联网查询
+GEOCODE_CACHE_PATH = Path.home() / ".earth_zones_cache.db"
+GEOCODE_CACHE_TTL_SEC = 30 * 24 * 3600  # 30 天
+# “未找到”的结果也缓存，但有效期较短（避免拼写错误反复联网查询两次）
+GEOCODE_NEGATIVE_TTL_SEC = 24 * 3600  # 1 天
+
+# 分区边界及超范围输入归一化后保留的小数位：消除 origin + k*36 累加或取模带来的浮点误差
+# （如 44.700000000000045），使恰好输入边界经度（如 44.7 或 404.7）时按“左闭右开”落在东侧分区
+_LON_DECIMALS = 9
+
+# 点数不少于该值且装有 numpy 时，走向量化计算（点太少时 numpy 的调用开销反而更大）
+_VECTORIZE_MIN_POINTS = 32
+# 批量分区时元素数不少于该值且装有 numba 时，走 JIT 内核（小数组不值得多线程调度）
+_JIT_MIN_POINTS = 100_000
+# 管道输入时最多攒多少条结果再一次写出
+_PIPED_BATCH_SIZE = 1000
+
+
+# 经度输入：'116.7'、'116.7,39.9'、'116.7 39.9'
+_LON_RE = re.compile(r"^\s*([-+]?\d+(?:\.\d+)?)\s*(?:[,\s]\s*([-+]?\d+(?:\.\d+)?))?\s*$")
+
 
 def normalize_lon_edge(lon: float) -> float:
     """把经度归一化到 [-180, 180]，并保留 +180（不折叠成 -180）。
@@ -43,6 +81,9 @@ def normalize_lon_edge(lon: float) -> float:
     - 点经度我们常用 [-180, 180)；
     - 但 bbox 边界若用 [-180, 180) 会把 +180 折叠到 -180，导致区间端点“看起来相同”。
     """
+    # 绝大多数输入本就在范围内，直接返回（+0.0 把 -0.0 规整为 0.0，与取模结果一致）
+    if -180.0 <= lon <= 180.0:
+        return lon + 0.0
     x = (lon + 180.0) % 360.0 - 180.0
     # 这里的 x 可能是 -180（对应原始 lon 为 180 或 -180 或其他等价值）
     # 如果原始 lon 是正向的 180（或等价 540 等），我们把它当作 +180 保留
@@ -59,10 +100,15 @@ def normalize_lon_point(lon: float) -> float:
     return x
 
 
+def _round_lon_point(lon: float) -> float:
+    """点经度归一化到 [-180, 180) 并按 _LON_DECIMALS 取整。"""
+    return normalize_lon_point(round(normalize_lon_point(lon), _LON_DECIMALS))
+
+
 def parse_lon_from_text(s: str) -> Optional[float]:
     """解析经度输入：支持 '116.7'、'116.7,39.9'、'116.7 39.9'。"""
     s = s.strip()
-    m = re.match(r"^\s*([-+]?\d+(?:\.\d+)?)\s*(?:[,\s]\s*([-+]?\d+(?:\.\d+)?))?\s*$", s)
+    m = _LON_RE.match(s)
     if not m:
         return None
     try:
@@ -71,7 +117,7 @@ def parse_lon_from_text(s: str) -> Optional[float]:
         return None
     # 兼容 0~360
     if lon < -180 or lon > 180:
-        lon = normalize_lon_point(lon)
+        lon = _round_lon_point(lon)
     return lon
 
 
@@ -104,25 +150,37 @@ def circular_min_cover_interval(lons: List[float]) -> Optional[Tuple[float, floa
     if not lons:
         return None
 
-    pts = sorted(lon_to_360(l) for l in lons)
-    if len(pts) == 1:
-        w = lon360_to_edge(pts[0])
-        return (w, w)
-
-    # 找最大 gap
-    max_gap = -1.0
-    max_i = 0
-    for i in range(len(pts)):
-        a = pts[i]
-        b = pts[(i + 1) % len(pts)]
-        gap = (b - a) % 360.0
-        if gap > max_gap:
-            max_gap = gap
-            max_i = i
-
-    # 最大 gap 从 pts[max_i] 到 pts[max_i+1]，覆盖区间取其补集：
-    east_start = pts[(max_i + 1) % len(pts)]
-    west_start = pts[max_i]
+    n = len(lons)
+    if np is not None and n >= _VECTORIZE_MIN_POINTS:
+        # 点数较多时用 numpy 在 C 层完成排序与求间隙
+        arr = np.mod(np.asarray(lons, dtype=np.float64), 360.0)
+        arr.sort()
+        gaps = np.empty_like(arr)
+        gaps[:-1] = np.diff(arr)
+        gaps[-1] = (arr[0] + 360.0) - arr[-1]
+        max_i = int(gaps.argmax())
+        east_start = float(arr[(max_i + 1) % n])
+        west_start = float(arr[max_i])
+    else:
+        pts = sorted(lon_to_360(l) for l in lons)
+        if n == 1:
+            w = lon360_to_edge(pts[0])
+            return (w, w)
+
+        # 找最大 gap
+        max_gap = -1.0
+        max_i = 0
+        for i in range(n):
+            a = pts[i]
+            b = pts[(i + 1) % n]
+            gap = (b - a) % 360.0
+            if gap > max_gap:
+                max_gap = gap
+                max_i = i
+
+        # 最大 gap 从 pts[max_i] 到 pts[max_i+1]，覆盖区间取其补集：
+        east_start = pts[(max_i + 1) % n]
+        west_start = pts[max_i]
 
     # 覆盖区间从 east_start 向前到 west_start（沿正向增加）
     west_360 = east_start
@@ -135,35 +193,91 @@ def circular_min_cover_interval(lons: List[float]) -> Optional[Tuple[float, floa
     return (west, east)
 
 
-def extract_lons_from_geojson(geom) -> List[float]:
-    """从 Nominatim 返回的 GeoJSON geometry 提取所有经度点。"""
-    lons: List[float] = []
-    if not geom or not isinstance(geom, dict):
-        return lons
+def _is_position(obj) -> bool:
+    """是否为 GeoJSON 坐标点 [lon, lat]。"""
+    return (
+        isinstance(obj, (list, tuple))
+        and len(obj) == 2
+        and isinstance(obj[0], (int, float))
+        and isinstance(obj[1], (int, float))
+    )
 
-    def walk_coords(obj):
-        if isinstance(obj, (list, tuple)):
-            if len(obj) == 2 and all(isinstance(x, (int, float)) for x in obj):
-                # [lon, lat]
-                lons.append(float(obj[0]))
-            else:
-                for it in obj:
-                    walk_coords(it)
 
-    coords = geom.get("coordinates")
-    walk_coords(coords)
-    return lons
+def extract_lon_spans_from_geojson(geom) -> List[Tuple[float, float]]:
+    """从 GeoJSON geometry 逐环（Polygon 的环 / LineString）提取经度范围 (west, east)。
 
+    一个环在经度上是连续的，只需其两端即可代表它覆盖的经度，
+    国家级 MultiPolygon 的数万个点因此压缩为几百个区间，交给 circular_min_cover_spans。
+    按 GeoJSON 惯例环在 ±180° 处已被切开，此时 (west, east) 就是环内经度的最小/最大值；
+    个别未切开的环（跨度超过 180°）改用 circular_min_cover_interval 求其区间（可能 west > east）。
+    """
+    spans: List[Tuple[float, float]] = []
+    if not geom or not isinstance(geom, dict):
+        return spans
 
-@dataclass(frozen=True)
-class ZoneInterval:
+    stack = [geom.get("coordinates")]
+    while stack:
+        obj = stack.pop()
+        if not isinstance(obj, (list, tuple)) or not obj:
+            continue
+        if _is_position(obj):
+            # Point / MultiPoint 中的单点
+            lon = float(obj[0])
+            spans.append((lon, lon))
+        elif _is_position(obj[0]):
+            lons = [float(p[0]) for p in obj if _is_position(p)]
+            west, east = min(lons), max(lons)
+            if east - west > 180.0:
+                west, east = circular_min_cover_interval(lons)
+            spans.append((west, east))
+        else:
+            stack.extend(reversed(obj))
+    return spans
+
+
+def circular_min_cover_spans(spans: List[Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+    """在圆周上计算覆盖所有经度区间的最短区间（circular_min_cover_interval 的区间版）。
+
+    输入 spans：(west, east) 区间列表，west > east 表示跨越 ±180°；west == east 即单点。
+    返回值约定同 circular_min_cover_interval；区间并集覆盖整圈时返回 (-180.0, 180.0)。
+
+    算法：区间映射到 [0,360) 后按起点排序，扫描并集的空隙；最短覆盖区间是最大空隙的补集。
+    """
+    if not spans:
+        return None
+
+    arcs = []
+    for west, east in spans:
+        length = east - west if west <= east else east - west + 360.0
+        if length >= 360.0:
+            return (-180.0, 180.0)
+        arcs.append((lon_to_360(west), length))
+    arcs.sort()
+
+    # 从“最远终点绕回一圈后的位置”开始扫描，第一段空隙即为跨过 0° 的那段
+    reach = max(start + length for start, length in arcs) - 360.0
+    max_gap = 0.0
+    gap = None
+    for start, length in arcs:
+        if start > reach:
+            if start - reach > max_gap:
+                max_gap = start - reach
+                gap = (reach, start)
+        reach = max(reach, start + length)
+
+    if gap is None:
+        return (-180.0, 180.0)
+    # 覆盖区间从空隙终点向东到空隙起点
+    return (lon360_to_edge(lon_to_360(gap[1])), lon360_to_edge(lon_to_360(gap[0])))
+
+
+class ZoneInterval(NamedTuple):
     zone: int
     west: float
     east: float
 
 
-@dataclass(frozen=True)
-class PlaceResult:
+class PlaceResult(NamedTuple):
     query: str
     center_lon: float
     center_zone: ZoneInterval
@@ -174,33 +288,39 @@ class PlaceResult:
     note: Optional[str] = None
 
 
-def build_zone_intervals(east_boundary_zone9: float = LANGFANG_LON_EAST_BOUNDARY) -> List[ZoneInterval]:
-    """构造 10 个分区的经度区间（每区 36°，左闭右开）。"""
+@lru_cache(maxsize=8)
+def _zone_origin(east_boundary_zone9: float = LANGFANG_LON_EAST_BOUNDARY) -> float:
+    """第9区西边界（各分区的起算点），按东边界缓存。"""
     east_b = normalize_lon_point(east_boundary_zone9)
-    origin = normalize_lon_point(east_b - ZONE_WIDTH_DEG)  # 第9区西边界
+    return _round_lon_point(east_b - ZONE_WIDTH_DEG)
+
+
+@lru_cache(maxsize=8)
+def build_zone_intervals(east_boundary_zone9: float = LANGFANG_LON_EAST_BOUNDARY) -> Tuple[ZoneInterval, ...]:
+    """构造 10 个分区的经度区间（每区 36°，左闭右开）。
+
+    结果按“自第9区起向东的步数”排列（下标 i 对应第 (9-i)%10 区），并按东边界缓存；
+    返回 tuple，避免调用方改动缓存内容。
+    """
+    origin = _zone_origin(east_boundary_zone9)
 
     intervals: List[ZoneInterval] = []
     for steps_east in range(10):
         zone = (9 - steps_east) % 10
-        west = normalize_lon_point(origin + steps_east * ZONE_WIDTH_DEG)
-        east = normalize_lon_point(west + ZONE_WIDTH_DEG)
+        west = _round_lon_point(origin + steps_east * ZONE_WIDTH_DEG)
+        east = _round_lon_point(west + ZONE_WIDTH_DEG)
         intervals.append(ZoneInterval(zone=zone, west=west, east=east))
-    return intervals
+    return tuple(intervals)
 
 
-def lon_to_zone_interval(lon: float, east_boundary_zone9: float = LANGFANG_LON_EAST_BOUNDARY) -> ZoneInterval:
-    """将点经度映射到一个分区（返回该分区的区间）。"""
-    lon_n = normalize_lon_point(lon)
-    east_b = normalize_lon_point(east_boundary_zone9)
-    origin = normalize_lon_point(east_b - ZONE_WIDTH_DEG)  # 第9区西边界
+# 默认（廊坊经线）分区表：模块加载时预先算好
+_DEFAULT_ZONES = build_zone_intervals()
 
-    diff = (lon_n - origin) % 360.0
-    steps_east = int(math.floor(diff / ZONE_WIDTH_DEG))  # 0..9
-    zone = (9 - steps_east) % 10
 
-    west = normalize_lon_point(origin + steps_east * ZONE_WIDTH_DEG)
-    east = normalize_lon_point(west + ZONE_WIDTH_DEG)
-    return ZoneInterval(zone=zone, west=west, east=east)
+def _zone_intervals(east_boundary_zone9: float) -> Tuple[ZoneInterval, ...]:
+    if east_boundary_zone9 == LANGFANG_LON_EAST_BOUNDARY:
+        return _DEFAULT_ZONES
+    return build_zone_intervals(east_boundary_zone9)
 
 
 def split_range(west: float, east: float) -> List[Tuple[float, float]]:
@@ -213,31 +333,146 @@ def split_range(west: float, east: float) -> List[Tuple[float, float]]:
     return [(w, 180.0), (-180.0, e)]
 
 
-def ranges_intersect(a: Tuple[float, float], b: Tuple[float, float]) -> bool:
-    a0, a1 = a
-    b0, b1 = b
-    return (a0 < b1) and (b0 < a1)
+@lru_cache(maxsize=8)
+def _zone_edges_360(east_boundary_zone9: float = LANGFANG_LON_EAST_BOUNDARY) -> Tuple[float, ...]:
+    """各分区西边界相对第9区西边界（origin）的偏移，落在 [0, 360)，按向东步数排列（升序）。"""
+    origin = _zone_origin(east_boundary_zone9)
+    return tuple((zi.west - origin) % 360.0 for zi in _zone_intervals(east_boundary_zone9))
+
+
+def _steps_east_of_origin(d: float, edges: Tuple[float, ...]) -> int:
+    """偏移 d（[0,360)）落在第几格。
+
+    在分区实际边界上二分查找（左闭右开），不受浮点误差影响，也不要求各分区等宽。
+    """
+    return bisect_right(edges, d) - 1
+
+
+@lru_cache(maxsize=4096)
+def lon_to_zone_interval(lon: float, east_boundary_zone9: float = LANGFANG_LON_EAST_BOUNDARY) -> ZoneInterval:
+    """将点经度映射到一个分区（返回该分区的区间）。大批量经度请用 lons_to_zones。
+
+    按 (lon, 东边界) 原值缓存：同一地点反复查询时直接命中。
+    超出 [-180, 180) 的经度先按 _round_lon_point 归一化，恰在边界上的等价经度落在同一分区：
+
+    >>> all(lon_to_zone_interval(z.west + 360 * k).zone == z.zone
+    ...     for z in build_zone_intervals() for k in range(-3, 4))
+    True
+    """
+    if not math.isfinite(lon):
+        # bisect 不会拒绝 NaN/inf，会静默落到某个分区，必须显式报错
+        raise ValueError(f"经度必须是有限数值：{lon}")
+    if not -180.0 <= lon < 180.0:
+        # 直接取模会带入 360 的倍数的舍入误差（如 188.7 - 80.7 = 107.99999999999999）
+        lon = _round_lon_point(lon)
+    diff = (lon - _zone_origin(east_boundary_zone9)) % 360.0
+    steps_east = _steps_east_of_origin(diff, _zone_edges_360(east_boundary_zone9))  # 0..9
+    return _zone_intervals(east_boundary_zone9)[steps_east]
+
+
+def _round_lon_points(lons):
+    """_round_lon_point 的 numpy 版（逐元素）。"""
+    x = np.round(np.mod(lons + 180.0, 360.0) - 180.0, _LON_DECIMALS)
+    x[x >= 180.0] -= 360.0
+    return x
+
+
+_LONS_TO_ZONES_NB = None  # 编译后的内核；False 表示未安装 numba
+
+
+def _get_lons_to_zones_nb() -> Optional[Callable]:
+    """首次调用时导入 numba 并编译 lons_to_zones 的内核；未安装 numba 时返回 None。"""
+    global _LONS_TO_ZONES_NB
+    if _LONS_TO_ZONES_NB is None:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            _LONS_TO_ZONES_NB = False
+            return None
+
+        @njit(cache=True, parallel=True)
+        def _lons_to_zones_nb(lons, origin, edges, out):
+            """单次并行遍历，不产生中间数组。
+
+            与 _steps_east_of_origin 一样在实际分区边界上二分，不要求各分区等宽。
+            不开 fastmath，以免改变边界处的取模结果。
+            """
+            for i in prange(lons.shape[0]):
+                d = (lons[i] - origin) % 360.0
+                k = np.searchsorted(edges, d, side="right") - 1
+                out[i] = (9 - k) % 10
+
+        _LONS_TO_ZONES_NB = _lons_to_zones_nb
+    return _LONS_TO_ZONES_NB or None
+
+
+def lons_to_zones(lons, east_boundary_zone9: float = LANGFANG_LON_EAST_BOUNDARY):
+    """批量版 lon_to_zone_interval：经度数组 -> 分区号数组（np.int8，形状不变）。
+
+    需要 numpy。各分区边界与 lon_to_zone_interval 完全一致（同样按实际边界左闭右开，
+    超范围经度同样先归一化取整）；含 NaN/inf 时同样抛出 ValueError。
+    """
+    if np is None:
+        raise ImportError("批量分区需要 numpy：请先运行 pip install numpy")
+    arr = np.asarray(lons, dtype=np.float64)
+    if not np.isfinite(arr).all():
+        # 与 lon_to_zone_interval 一致：NaN/inf 报错，而不是随数组大小（numba/numpy 路径）得到不同分区
+        raise ValueError("经度数组中含有非有限数值（NaN 或 inf）")
+    out_of_range = ~((arr >= -180.0) & (arr < 180.0))
+    if out_of_range.any():
+        # 与 lon_to_zone_interval 相同：超范围经度先归一化并取整，避免 360 倍数的舍入误差
+        arr = arr.copy()
+        arr[out_of_range] = _round_lon_points(arr[out_of_range])
+    kernel = _get_lons_to_zones_nb() if arr.size >= _JIT_MIN_POINTS else None
+    if kernel is not None:
+        flat = np.ascontiguousarray(arr).ravel()
+        out = np.empty(flat.shape, dtype=np.int8)
+        kernel(
+            flat,
+            _zone_origin(east_boundary_zone9),
+            np.asarray(_zone_edges_360(east_boundary_zone9)),
+            out,
+        )
+        return out.reshape(arr.shape)
+
+    diff = np.mod(arr - _zone_origin(east_boundary_zone9), 360.0)
+    edges = np.asarray(_zone_edges_360(east_boundary_zone9))
+    steps_east = np.searchsorted(edges, diff, side="right") - 1
+    return ((9 - steps_east) % 10).astype(np.int8)
 
 
 def zones_covered_by_lon_range(bbox_west: float, bbox_east: float, east_boundary_zone9: float = LANGFANG_LON_EAST_BOUNDARY) -> Tuple[ZoneInterval, ...]:
-    """给定地点经度范围（west/east），返回覆盖到的所有分区。"""
-    parts = split_range(bbox_west, bbox_east)
-    intervals = build_zone_intervals(east_boundary_zone9)
-
-    covered: List[ZoneInterval] = []
-    for zi in intervals:
-        zi_parts = split_range(zi.west, zi.east)
-        hit = False
-        for p in parts:
-            for zp in zi_parts:
-                if ranges_intersect(p, zp):
-                    hit = True
-                    break
-            if hit:
-                break
-        if hit:
-            covered.append(zi)
+    """给定地点经度范围（west/east），返回覆盖到的所有分区。
 
+    把 bbox 两端换算成相对第9区西边界（origin）的偏移，在分区边界上二分得到起止分区，
+    再向东依次取分区，无需逐区求交。
+    """
+    west = normalize_lon_edge(bbox_west)
+    east = normalize_lon_edge(bbox_east)
+    span = east - west if west <= east else east - west + 360.0  # 跨线时绕过 ±180°；全球 bbox 为 360
+    intervals = _zone_intervals(east_boundary_zone9)
+    edges = _zone_edges_360(east_boundary_zone9)
+    origin = _zone_origin(east_boundary_zone9)
+
+    dw = (west - origin) % 360.0
+    i_start = _steps_east_of_origin(dw, edges)
+    if span >= 360.0:
+        count = 10
+    elif span <= 0.0:
+        # bbox 端点相同（退化为一条经线）：只取其所在分区
+        count = 1
+    else:
+        de = (east - origin) % 360.0
+        i_end = _steps_east_of_origin(de, edges)
+        if de == edges[i_end]:
+            # 东端恰好落在分区西边界上（右开），不算覆盖该分区
+            i_end -= 1
+        count = (i_end - i_start) % 10 + 1
+        if i_end == i_start and de <= dw:
+            # 起止落在同一分区但绕了一圈
+            count = 10
+
+    covered = [intervals[(i_start + k) % 10] for k in range(count)]
     # 显示稳定：按区号从小到大
     covered.sort(key=lambda x: x.zone)
     return tuple(covered)
@@ -276,44 +511,144 @@ def pretty_lon_range(west: float, east: float) -> str:
     )
 
 
-def geocode_place(query: str) -> Tuple[Optional[float], Optional[Tuple[float, float]], Optional[str]]:
-    """在线地理编码：返回 (中心点经度, (bbox_west,bbox_east) 或 None, 说明/错误信息)"""
+GeocodeResult = Tuple[Optional[float], Optional[Tuple[float, float]], Optional[str]]
+
+_CACHE_CONN: Optional[sqlite3.Connection] = None
+
+
+def _geocode_cache() -> sqlite3.Connection:
+    """打开（仅首次）地理编码缓存库并确保表存在。"""
+    global _CACHE_CONN
+    if _CACHE_CONN is None:
+        conn = sqlite3.connect(str(GEOCODE_CACHE_PATH))
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocode ("
+            "query TEXT PRIMARY KEY, lon REAL, west REAL, east REAL, note TEXT, ts INTEGER)"
+        )
+        _CACHE_CONN = conn
+    return _CACHE_CONN
+
+
+def _cache_key(query: str) -> str:
+    """缓存键：去掉首尾及多余空白，忽略大小写。"""
+    return " ".join(query.split()).casefold()
+
+
+def _cache_get(query: str) -> Optional[GeocodeResult]:
+    """查缓存；未命中、已过期或缓存不可用时返回 None。
+
+    命中“未找到”记录时返回 (None, None, 说明)。
+    """
     try:
+        row = _geocode_cache().execute(
+            "SELECT lon, west, east, note, ts FROM geocode WHERE query = ?", (_cache_key(query),)
+        ).fetchone()
+    except Exception:
+        return None
+    if row is None:
+        return None
+    lon, west, east, note, ts = row
+    ttl = GEOCODE_CACHE_TTL_SEC if lon is not None else GEOCODE_NEGATIVE_TTL_SEC
+    if time.time() - ts > ttl:
+        return None
+    bbox = (west, east) if west is not None and east is not None else None
+    return lon, bbox, note
+
+
+def _cache_put(query: str, lon: Optional[float], bbox: Optional[Tuple[float, float]], note: Optional[str]) -> None:
+    """写缓存；失败时静默忽略（缓存问题不应影响查询本身）。"""
+    west, east = bbox if bbox is not None else (None, None)
+    try:
+        conn = _geocode_cache()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO geocode (query, lon, west, east, note, ts) VALUES (?, ?, ?, ?, ?, ?)",
+                (_cache_key(query), lon, west, east, note, int(time.time())),
+            )
+    except Exception:
+        pass
+
+
+_GEOLOCATOR: Optional[Nominatim] = None
+_GEOCODE: Optional[Callable] = None
+
+
+def _get_geolocator() -> Callable:
+    """返回复用的 Nominatim.geocode（已按 Nominatim 使用政策限速为每秒最多 1 次）。
+
+    Nominatim 实例只在首次调用时创建，之后复用其 HTTP 连接池。
+    未安装 geopy 时抛出 ImportError。
+    """
+    global _GEOLOCATOR, _GEOCODE
+    if _GEOCODE is None:
+        from geopy.extra.rate_limiter import RateLimiter
         from geopy.geocoders import Nominatim
+
+        _GEOLOCATOR = Nominatim(user_agent="earth_zone_mapper/1.1", timeout=5)
+        _GEOCODE = RateLimiter(_GEOLOCATOR.geocode, min_delay_seconds=1, max_retries=0, swallow_exceptions=False)
+    return _GEOCODE
+
+
+def _tighten_global_bbox(bbox: Tuple[float, float], raw: dict) -> Tuple[float, float]:
+    """修正“全球 bbox”：有些跨越日期变更线的国家会返回 [-180,180]，改用其几何求最短经度区间。
+
+    其他 bbox，或 raw 中没有可用几何、几何无法解析时，原样返回（不影响点坐标结果）。
+    """
+    west, east = bbox
+    if west != -180.0 or east != 180.0:
+        return bbox
+    try:
+        geom = raw.get("geojson") or raw.get("geometry")
+        tight = circular_min_cover_spans(extract_lon_spans_from_geojson(geom))
+    except Exception:
+        return bbox
+    if tight is None:
+        return bbox
+    return (normalize_lon_edge(tight[0]), normalize_lon_edge(tight[1]))
+
+
+def geocode_place(query: str) -> GeocodeResult:
+    """在线地理编码：返回 (中心点经度, (bbox_west,bbox_east) 或 None, 说明/错误信息)
+
+    结果会写入本地 sqlite 缓存（GEOCODE_CACHE_PATH），有效期内直接读缓存；
+    “未找到”也会短期缓存。网络/服务错误不缓存。
+    """
+    cached = _cache_get(query)
+    if cached is not None:
+        return cached
+
+    try:
+        geocode = _get_geolocator()
     except Exception:
         return None, None, "未安装 geopy：请先运行 pip install geopy，或直接输入经度。"
 
     try:
-        geolocator = Nominatim(user_agent="earth_zone_mapper/1.1")
-        loc = geolocator.geocode(query, language="zh", geometry="geojson")
+        loc = geocode(query, language="zh", geometry="geojson")
         if not loc:
-            loc = geolocator.geocode(query, language="en", geometry="geojson")
+            loc = geocode(query, language="en", geometry="geojson")
         if not loc:
-            return None, None, "未找到该地点，请尝试更完整的写法（如 'Bangkok, Thailand'）。"
+            note = "未找到该地点，请尝试更完整的写法（如 'Bangkok, Thailand'）。"
+            _cache_put(query, None, None, note)
+            return None, None, note
 
+        raw = getattr(loc, "raw", None)
+        if not isinstance(raw, dict):
+            raw = {}
         bbox = None
-        try:
-            raw = getattr(loc, "raw", None) or {}
-            bb = raw.get("boundingbox")
-            # Nominatim boundingbox 通常是 [south_lat, north_lat, west_lon, east_lon]（字符串）
-            if isinstance(bb, (list, tuple)) and len(bb) == 4:
-                west = normalize_lon_edge(float(bb[2]))
-                east = normalize_lon_edge(float(bb[3]))
-                bbox = (west, east)
-
-            # 修正：有些跨越日期变更线的国家会返回 [-180,180] 这种“全球 bbox”
-            if bbox is not None:
-                west, east = bbox
-                if west == -180.0 and east == 180.0:
-                    geom = raw.get("geojson") or raw.get("geometry")
-                    lons = extract_lons_from_geojson(geom)
-                    tight = circular_min_cover_interval(lons)
-                    if tight is not None:
-                        bbox = (normalize_lon_edge(tight[0]), normalize_lon_edge(tight[1]))
-        except Exception:
-            bbox = None
-
-        return float(loc.longitude), bbox, f"匹配到：{loc.address}"
+        bb = raw.get("boundingbox")
+        # Nominatim boundingbox 为 [south_lat, north_lat, west_lon, east_lon]（字符串）
+        if isinstance(bb, (list, tuple)) and len(bb) == 4:
+            try:
+                _s_lat, _n_lat, w_lon, e_lon = map(float, bb)
+            except (TypeError, ValueError):
+                pass
+            else:
+                bbox = _tighten_global_bbox((normalize_lon_edge(w_lon), normalize_lon_edge(e_lon)), raw)
+
+        lon = float(loc.longitude)
+        note = f"匹配到：{loc.address}"
+        _cache_put(query, lon, bbox, note)
+        return lon, bbox, note
     except Exception as e:
         return None, None, f"地理编码失败（可能是网络/服务限制）：{e}"
 
@@ -351,48 +686,142 @@ def resolve_query_to_place(query: str) -> Optional[PlaceResult]:
     )
 
 
-def print_place_result(res: PlaceResult) -> None:
+def format_place_result(res: PlaceResult) -> str:
+    """把 PlaceResult 格式化为多行文本（不含末尾换行）。"""
+    lines: List[str] = []
     if res.note:
-        print(f"ℹ️  {res.note}")
+        lines.append(f"ℹ️  {res.note}")
 
-    print(f"✅ 输入：{res.query}")
+    lines.append(f"✅ 输入：{res.query}")
 
     # 地点经度区间（若有 bbox）
     if res.bbox_west is not None and res.bbox_east is not None:
-        print("   地点经度区间：" + pretty_lon_range(res.bbox_west, res.bbox_east))
+        lines.append("   地点经度区间：" + pretty_lon_range(res.bbox_west, res.bbox_east))
     else:
-        print(f"   点经度：{res.center_lon:.6f}°")
+        lines.append(f"   点经度：{res.center_lon:.6f}°")
 
     # 所属分区输出
     if res.covered_zones:
         zones_list = ", ".join(str(z.zone) for z in res.covered_zones)
-        print(f"   覆盖分区：{zones_list}")
+        lines.append(f"   覆盖分区：{zones_list}")
         for z in res.covered_zones:
-            print(f"     - 第 {z.zone} 区区间：{pretty_range(z.west, z.east)}  （左闭右开）")
+            lines.append(f"     - 第 {z.zone} 区区间：{pretty_range(z.west, z.east)}  （左闭右开）")
     else:
         z = res.center_zone
-        print(f"   所属分区：第 {z.zone} 区")
-        print(f"   分区区间：{pretty_range(z.west, z.east)}  （左闭右开）")
+        lines.append(f"   所属分区：第 {z.zone} 区")
+        lines.append(f"   分区区间：{pretty_range(z.west, z.east)}  （左闭右开）")
 
-    print("")
+    return "\n".join(lines)
 
 
-def main() -> int:
-    print("\n地球经度分区（10区，每区 36°）")
-    print(f"默认：第9区 = [{LANGFANG_LON_EAST_BOUNDARY:.4f}°-36°, {LANGFANG_LON_EAST_BOUNDARY:.4f}°) （以廊坊经线为第9区东边界）")
-    print("输入地点名或经度；输入 q 退出。\n")
+def print_place_result(res: PlaceResult) -> None:
+    print(format_place_result(res), end="\n\n")
 
-    while True:
-        s = input("请输入地点/经度：").strip()
+
+def print_place_results_batch(results: List[PlaceResult]) -> None:
+    """批量输出多个结果：拼成一个字符串后一次写出，格式与逐个 print_place_result 相同。"""
+    sys.stdout.write("".join(format_place_result(res) + "\n\n" for res in results))
+    sys.stdout.flush()
+
+
+def run_batch(f) -> int:
+    """批量模式：f 中每行一个经度（格式同交互输入），输出“经度<TAB>分区号”，每行一条。
+
+    先逐行解析，再用 lons_to_zones 一次性分区；无法解析的行报告到 stderr 并跳过。
+    """
+    if np is None:
+        print("❌ 批量模式需要 numpy：请先运行 pip install numpy", file=sys.stderr)
+        return 1
+
+    lons: List[float] = []
+    for lineno, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        lon = parse_lon_from_text(line)
+        if lon is None:
+            print(f"❌ 第 {lineno} 行无法解析为经度：{line.strip()}", file=sys.stderr)
+            continue
+        lons.append(lon)
+
+    if lons:
+        zones = lons_to_zones(np.asarray(lons)).tolist()
+        sys.stdout.write("".join(f"{normalize_lon_point(lon):.6f}\t{zone}\n" for lon, zone in zip(lons, zones)))
+    return 0
+
+
+def _handle_input(s: str) -> bool:
+    """处理一行输入（地点名或经度）并输出结果；返回 False 表示用户要求退出。"""
+    s = s.strip()
+    if not s:
+        return True
+    if s.lower() in {"q", "quit", "exit"}:
+        return False
+
+    res = resolve_query_to_place(s)
+    if res is not None:
+        print_place_result(res)
+    return True
+
+
+def _run_piped(lines) -> int:
+    """管道/重定向输入：逐行解析，结果攒批后用 print_place_results_batch 一次写出。
+
+    经度行本地即可算完，连续的经度行合并写出；遇到需联网的地点名前先写出已攒的结果，
+    使其与 resolve_query_to_place 直接打印的错误信息保持输入顺序。
+    """
+    pending: List[PlaceResult] = []
+    for line in lines:
+        s = line.strip()
         if not s:
             continue
         if s.lower() in {"q", "quit", "exit"}:
-            return 0
+            break
+        if pending and parse_lon_from_text(s) is None:
+            print_place_results_batch(pending)
+            pending = []
 
         res = resolve_query_to_place(s)
-        if res is None:
-            continue
-        print_place_result(res)
+        if res is not None:
+            pending.append(res)
+            if len(pending) >= _PIPED_BATCH_SIZE:
+                print_place_results_batch(pending)
+                pending = []
+
+    if pending:
+        print_place_results_batch(pending)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="地球经度分区（10区，每区 36°）")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        type=argparse.FileType("r", encoding="utf-8"),
+        help="批量模式：FILE 每行一个经度（或 经度,纬度），输出 经度<TAB>分区号；- 表示标准输入（需要 numpy）",
+    )
+    args = parser.parse_args(argv)
+
+    if args.batch is not None:
+        with args.batch:
+            return run_batch(args.batch)
+
+    if not sys.stdin.isatty():
+        # 管道/重定向输入：不打印欢迎语和提示符
+        return _run_piped(sys.stdin)
+
+    print("\n地球经度分区（10区，每区 36°）")
+    print(f"默认：第9区 = [{LANGFANG_LON_EAST_BOUNDARY:.4f}°-36°, {LANGFANG_LON_EAST_BOUNDARY:.4f}°) （以廊坊经线为第9区东边界）")
+    print("输入地点名或经度；输入 q 退出。\n")
+
+    while True:
+        try:
+            s = input("请输入地点/经度：")
+        except EOFError:
+            print("")
+            return 0
+        if not _handle_input(s):
+            return 0
 
 
 if __name__ == "__main__":